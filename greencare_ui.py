@@ -0,0 +1,411 @@
+"""
+Shared page layout for the GreenCare Streamlit app.
+
+Everything here is imported once per process, so the static CSS/HTML and
+agent tables are built a single time instead of on every script rerun.
+app.py only has to supply the reply function.
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+# One chat message. Conversations are lists of these rather than dicts:
+# they are smaller in session state and cheaper to read in the sidebar loop.
+Msg = namedtuple("Msg", ["role", "content"])
+
+AGENTS = ["Health Companion", "Financial Agent", "Orchestrator"]
+
+# Map the UI agent names to your Ark agent IDs / names.
+# TODO: replace these strings with the actual Ark agent identifiers.
+ARK_AGENT_IDS = {
+    "Health Companion": "health_companion_agent",
+    "Financial Agent": "financial_agent",
+    "Orchestrator": "orchestrator_agent",
+}
+
+# --- GLOBAL CUSTOM CSS (green sidebar + dark main, cards, chat input) ---
+CUSTOM_CSS = """
+<style>
+/* Overall app font (colours come from .streamlit/config.toml) */
+.stApp {
+    font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+}
+
+/* Sidebar styling */
+[data-testid="stSidebar"] {
+    background: linear-gradient(180deg, #065f46, #022c22);
+    color: #ECFDF5;
+    border-right: 1px solid #064e3b;
+    min-width: 320px !important;
+    max-width: 320px !important;
+}
+[data-testid="stSidebar"] * {
+    color: #ECFDF5 !important;
+}
+
+/* New Chat button styling */
+[data-testid="stSidebar"] .stButton > button {
+    width: 100%;
+    border-radius: 999px;
+    background-color: #22c55e;
+    color: #022c22;
+    border: 1px solid #bbf7d0;
+    font-weight: 600;
+    padding: 0.6rem 1rem;
+}
+[data-testid="stSidebar"] .stButton > button:hover {
+    background-color: #16a34a;
+}
+
+/* Agent select label */
+[data-testid="stSidebar"] [data-testid="stSelectbox"] label {
+    font-weight: 600;
+}
+
+/* Main header area */
+.main-header {
+    padding-top: 0.75rem;
+}
+.hero-title {
+    font-size: 2.6rem;
+    font-weight: 800;
+    letter-spacing: -0.03em;
+}
+.hero-sub {
+    font-size: 1.4rem;
+    font-weight: 600;
+    color: #6ee7b7;
+    margin-bottom: 1.2rem;
+}
+
+/* Cards row like RoboClinic */
+.card-row {
+    display: flex;
+    gap: 1rem;
+    margin-bottom: 1.8rem;
+    margin-top: 0.5rem;
+}
+.feature-card {
+    background: #0b1120;
+    border-radius: 1.25rem;
+    padding: 1.2rem 1.35rem;
+    box-shadow: 0 18px 40px rgba(0,0,0,0.55);
+    flex: 1;
+    border: 1px solid #1f2937;
+}
+.card-title {
+    font-weight: 700;
+    margin-bottom: 0.2rem;
+}
+.card-sub {
+    font-weight: 600;
+    font-size: 0.9rem;
+    color: #a7f3d0;
+    margin-bottom: 0.5rem;
+}
+.card-body {
+    font-size: 0.86rem;
+    line-height: 1.4;
+    color: #d1d5db;
+}
+
+/* Chat messages */
+[data-testid="stChatMessage"] {
+    background-color: #020617;
+    border-radius: 1rem;
+    padding: 0.75rem 1rem;
+    margin-bottom: 0.75rem;
+    border: 1px solid #111827;
+}
+[data-testid="stChatMessage"] p {
+    font-size: 0.95rem;
+}
+
+/* Chat input area */
+[data-testid="stChatInput"] {
+    border-top: 1px solid #111827;
+}
+[data-testid="stChatInput"] textarea {
+    border-radius: 999px !important;
+    background-color: #020617 !important;
+    color: #F9FAFB !important;
+    border: 1px solid #1f2937 !important;
+    padding: 0.8rem 1rem !important;
+}
+[data-testid="stChatInput"] label {
+    color: #9ca3af !important;
+}
+
+/* Hide Streamlit branding footer */
+footer, #MainMenu {
+    visibility: hidden;
+}
+</style>
+"""
+
+# --- STATIC MAIN HEADER + SIDEBAR TEXT ---
+HERO_HTML = """
+<div class="main-header">
+    <div class="hero-title">AI health chat</div>
+    <div class="hero-sub">for patients, professionals, and their finances.</div>
+    <div class="card-row">
+        <div class="feature-card">
+            <div class="card-title">Health Companion</div>
+            <div class="card-sub">Daily wellbeing support.</div>
+            <div class="card-body">
+                Check in on symptoms, mood, habits, and routines. 
+                Get gentle, personalised nudges to stay on top of your health.
+            </div>
+        </div>
+        <div class="feature-card">
+            <div class="card-title">Financial Agent</div>
+            <div class="card-sub">Money and medical costs.</div>
+            <div class="card-body">
+                Talk through treatment expenses, budgeting, and saving goals 
+                while keeping your health journey sustainable.
+            </div>
+        </div>
+        <div class="feature-card">
+            <div class="card-title">Orchestrator</div>
+            <div class="card-sub">One brain for many agents.</div>
+            <div class="card-body">
+                Coordinates different specialised agents so you get one
+                coherent conversation instead of scattered advice.
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+# CSS and hero go out as one st.html element (no Markdown parsing).
+PAGE_HEADER_HTML = CUSTOM_CSS + HERO_HTML
+
+SIDEBAR_TIP = "Tip: switch agents to change how the assistant responds."
+
+# Recent chats entries are cut to this many characters.
+PREVIEW_CHARS = 50
+
+# Each agent keeps at most this many user/assistant turns in session state;
+# older turns are dropped so memory per session stays bounded.
+MAX_SESSION_TURNS = 200
+
+# How often the "typing" placeholder checks whether a reply has arrived.
+# Used until an agent has answered once; after that the interval follows
+# that agent's typical reply time, kept within the MIN/MAX bounds.
+REPLY_POLL_SECONDS = 0.5
+MIN_REPLY_POLL_SECONDS = 0.2
+MAX_REPLY_POLL_SECONDS = 2.0
+
+# Reply calls are almost entirely waiting on Ark, so the pool is sized for
+# concurrent Ark requests across all sessions, not for CPU cores. Each
+# session has at most one reply in flight per agent.
+REPLY_WORKERS = 16
+
+
+@st.cache_resource
+def get_reply_pool():
+    """Worker threads that run reply_fn, shared by every session."""
+    return ThreadPoolExecutor(
+        max_workers=REPLY_WORKERS, thread_name_prefix="ark-reply"
+    )
+
+
+def init_session_state():
+    """Create the per-session containers the page relies on."""
+    if "conversations" not in st.session_state:
+        st.session_state.conversations = {agent: [] for agent in AGENTS}
+
+    if "current_agent" not in st.session_state:
+        st.session_state.current_agent = AGENTS[0]
+
+    # agent -> (conversation length, Recent chats previews) for the sidebar
+    if "recent_cache" not in st.session_state:
+        st.session_state.recent_cache = {}
+
+    # agent -> Future of the assistant reply still being generated
+    if "pending_replies" not in st.session_state:
+        st.session_state.pending_replies = {}
+
+    # agent -> moving average of reply time in seconds
+    if "reply_latency" not in st.session_state:
+        st.session_state.reply_latency = {}
+
+
+def reply_poll_seconds(agent: str) -> float:
+    """Poll interval for ``agent``'s pending reply, from its past reply times."""
+    latency = st.session_state.reply_latency.get(agent)
+    if latency is None:
+        return REPLY_POLL_SECONDS
+    return min(max(latency / 4, MIN_REPLY_POLL_SECONDS), MAX_REPLY_POLL_SECONDS)
+
+
+def append_reply(agent: str, reply: str):
+    """Add an assistant reply to ``agent``'s conversation, trimming old turns."""
+    messages = st.session_state.conversations[agent]
+    messages.append(Msg("assistant", reply))
+
+    if len(messages) > MAX_SESSION_TURNS * 2:
+        del messages[:-MAX_SESSION_TURNS * 2]
+        # Length no longer changes once capped, so the preview key is stale.
+        st.session_state.recent_cache.pop(agent, None)
+
+
+def collect_finished_replies():
+    """Move replies whose background call has completed into their conversation."""
+    pending = st.session_state.pending_replies
+    for agent, future in list(pending.items()):
+        if future.done():
+            del pending[agent]
+            reply, seconds = future.result()
+            # Cache hits and local fallbacks report None; only real agent
+            # calls feed the latency estimate.
+            if seconds is not None:
+                previous = st.session_state.reply_latency.get(agent)
+                st.session_state.reply_latency[agent] = (
+                    seconds if previous is None else 0.7 * previous + 0.3 * seconds
+                )
+            append_reply(agent, reply)
+
+
+def render_pending_reply(agent: str):
+    """
+    "Typing" placeholder for a reply that is still being generated.
+
+    Only this fragment re-runs while waiting; once the reply is ready it
+    triggers one full rerun so the chat and sidebar pick it up.
+    """
+    future = st.session_state.pending_replies.get(agent)
+    if future is None or future.done():
+        st.rerun()
+    st.chat_message("assistant").write("…")
+
+
+def last_user_messages(conv, k: int = 3):
+    """Return the last ``k`` user messages, oldest first, scanning from the tail."""
+    out = []
+    for m in reversed(conv):
+        if m.role == "user":
+            out.append(m.content)
+            if len(out) == k:
+                break
+    out.reverse()
+    return out
+
+
+def recent_user_messages(agent: str):
+    """
+    Sidebar preview for ``agent``, cached in session state.
+
+    The cache is keyed by conversation length, so agents whose conversation
+    didn't change since the last rerun cost a single dict lookup. The
+    truncated preview strings are built on a cache miss only.
+    """
+    conv = st.session_state.conversations.get(agent, [])
+    cached = st.session_state.recent_cache.get(agent)
+    if cached is None or cached[0] != len(conv):
+        previews = [
+            f"• {text[:PREVIEW_CHARS]}…" if len(text) > PREVIEW_CHARS else f"• {text}"
+            for text in last_user_messages(conv)
+        ]
+        cached = (len(conv), previews)
+        st.session_state.recent_cache[agent] = cached
+    return cached[1]
+
+
+def render_sidebar():
+    with st.sidebar:
+        st.markdown("### 💚 AI Health Companion")
+
+        # New chat button (reset only current agent's conversation)
+        if st.button("✨ New chat"):
+            st.session_state.conversations[st.session_state.current_agent] = []
+            st.session_state.recent_cache.pop(st.session_state.current_agent, None)
+            # Drop any reply still in flight for the old conversation; if it
+            # hasn't reached a worker yet, cancel it so it never takes a slot.
+            future = st.session_state.pending_replies.pop(
+                st.session_state.current_agent, None
+            )
+            if future is not None:
+                future.cancel()
+
+        st.markdown("---")
+
+        # Agent selector
+        agent_choice = st.selectbox(
+            "Select an Agent:",
+            AGENTS,
+            index=AGENTS.index(st.session_state.current_agent)
+        )
+
+        # Update current agent
+        st.session_state.current_agent = agent_choice
+
+        st.markdown("---")
+        st.caption(SIDEBAR_TIP)
+
+        # Recent chats summary
+        st.markdown("#### Recent chats")
+        for agent in AGENTS:
+            user_msgs = recent_user_messages(agent)
+            if not user_msgs:
+                continue
+            st.markdown(f"**{agent}**")
+            for preview in user_msgs:
+                st.caption(preview)
+
+
+def render_chat(reply_fn):
+    """
+    Chat title, history and input for the current agent.
+
+    ``reply_fn(message, agent_type, history)`` returns ``(reply, seconds)``,
+    where ``seconds`` is how long the agent call took, or None if no agent
+    was called (cached or fallback reply). ``history`` is the list of
+    earlier ``Msg`` records. It runs on a worker
+    thread (see get_reply_pool), so it must not touch st.session_state.
+    """
+    current_agent = st.session_state.current_agent
+    waiting = current_agent in st.session_state.pending_replies
+
+    # --- CHAT TITLE ---
+    st.subheader(f"💬 Chat with your **{current_agent}**")
+
+    # --- CHAT DISPLAY (ONLY CURRENT AGENT) ---
+    messages = st.session_state.conversations[current_agent]
+
+    for msg in messages:
+        st.chat_message(msg.role).write(msg.content)
+
+    if waiting:
+        # Wrapped per run so run_every can follow the agent's reply time.
+        st.fragment(
+            render_pending_reply, run_every=reply_poll_seconds(current_agent)
+        )(current_agent)
+
+    # --- CHAT INPUT ---
+    # Disabled while a reply is pending so turns can't interleave.
+    if user_input := st.chat_input(
+        "Type a message or start with how you're feeling today...",
+        disabled=waiting,
+    ):
+        # Add user message to current agent's conversation
+        messages.append(Msg("user", user_input))
+
+        # Generate the assistant reply in the background, then rerun so the
+        # user's message shows immediately with the "typing" placeholder.
+        st.session_state.pending_replies[current_agent] = get_reply_pool().submit(
+            reply_fn, user_input, current_agent, messages[:-1]
+        )
+        st.rerun()
+
+
+def render_page(reply_fn):
+    """Render the whole page; call after st.set_page_config."""
+    # --- GLOBAL CSS + MAIN CONTENT HEADER (hero + cards) ---
+    st.html(PAGE_HEADER_HTML)
+
+    init_session_state()
+    collect_finished_replies()
+    render_sidebar()
+    render_chat(reply_fn)